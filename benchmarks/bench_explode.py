@@ -0,0 +1,91 @@
+"""Benchmark: vectorised explode_months against the old iterrows version.
+
+The dashboard no longer explodes MONTH strings (charts are built from the
+month-mask count cube, see mithron.cube); both versions live here for the
+record.
+
+Run from the repository root:
+
+    python benchmarks/bench_explode.py            # 100k rows
+    python benchmarks/bench_explode.py --rows 20000
+
+Exits non-zero if the speed-up is below --min-speedup (50x by default) or the
+two implementations disagree.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+MONTH_VALUES = [
+    "Jun, Jul", "June, July", "Aug, Oct, Nov", "Apr, May, June, Dec, Jan",
+    "Autumn, Winter", "Monsoon", "Annual", "October, November", "Mar", "",
+]
+
+
+def explode_months(df, col):
+    """One row per comma separated token of ``df[col]``.
+
+    Tokens keep their original order and the source row's index label; rows
+    with an empty or missing value are dropped.
+    """
+    tokens = df[col].where(df[col].notna(), "").astype(str).str.split(',')
+    exploded = df.assign(**{col: tokens}).explode(col)
+    exploded[col] = exploded[col].str.strip()
+    return exploded[exploded[col] != ""]
+
+
+def legacy_explode_months(df, col):
+    rows = []
+    for _, row in df.iterrows():
+        months = str(row[col]) if pd.notna(row[col]) else ""
+        for m in months.split(','):
+            m = m.strip()
+            if m:
+                r = row.copy()
+                r[col] = m
+                rows.append(r)
+    return pd.DataFrame(rows)
+
+
+def synthetic_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'S.NO': np.arange(1, n_rows + 1),
+        'CROP': rng.choice(['Paddy', 'Maize', 'Cotton', 'Banana', 'Groundnut'], n_rows),
+        'DISTRICT': rng.choice([f"District {i}" for i in range(40)], n_rows),
+        'MONTH': rng.choice(MONTH_VALUES, n_rows),
+    })
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--min-speedup", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    df = synthetic_frame(args.rows)
+    new, new_s = timed(explode_months, df, 'MONTH')
+    old, old_s = timed(legacy_explode_months, df, 'MONTH')
+
+    same = (list(new.columns) == list(old.columns)
+            and new.index.equals(old.index)
+            and new.astype(str).equals(old.astype(str)))
+    speedup = old_s / new_s
+    print(f"rows={args.rows} exploded={len(new)}")
+    print(f"iterrows   {old_s:9.3f}s")
+    print(f"vectorised {new_s:9.3f}s")
+    print(f"speed-up   {speedup:9.1f}x  (outputs {'match' if same else 'DIFFER'})")
+    return 0 if same and speedup >= args.min_speedup else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
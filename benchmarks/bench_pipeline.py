@@ -0,0 +1,129 @@
+"""Time every stage of the spray-planning pipeline on synthetic data.
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py                        # 10k, 100k, 1M rows
+    python benchmarks/bench_pipeline.py --rows 10000 --repeat 5 --output bench_results.json
+
+Stages: read_csv, clean_dataset, filter_rows, plan_spray, match_rain,
+count_cube (built once per dataset), chart_frames (cube projection + every
+chart aggregation), figures (every Plotly builder) and rerun (everything
+after the cached load and cube, i.e. what a widget interaction costs). The best of --repeat runs is reported per stage.
+Results are written as JSON for regression tracking.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from synthetic import DEFAULT_SIZES, generate  # noqa: E402
+from mithron import charts  # noqa: E402
+from mithron.cube import CountCube  # noqa: E402
+from mithron.derived import ChartFrames  # noqa: E402
+from mithron.engine import filter_rows, match_rain, plan_spray, state_month_names  # noqa: E402
+from mithron.loader import clean_dataset, read_csv  # noqa: E402
+from mithron.months import ALL_MONTHS  # noqa: E402
+
+STATE = "Kerala"
+
+
+def build_chart_frames(cube, offsets):
+    frames = ChartFrames(cube.project(offsets=offsets), state_month_names(STATE))
+    for name in ["spray_points", "spray_combinations", "crop_month_counts", "district_month_counts",
+                 "crop_month_spread", "district_rain_counts", "crop_rain_summary"]:
+        getattr(frames, name)
+    for col in ["MONTH", "CROP", "DISTRICT"]:
+        frames.value_counts(col)
+    return frames
+
+
+def build_figures(frames):
+    return [
+        charts.spray_scatter(frames),
+        charts.crop_month_line(frames),
+        charts.spray_month_scatter(frames),
+        charts.distribution_donut(frames, 'MONTH', "📅 Sowing Month"),
+        charts.district_month_bar(frames),
+        charts.crop_spread_radar(frames),
+        charts.district_rain_bar(frames),
+        charts.crop_rain_donut(frames),
+    ]
+
+
+def best_of(repeat, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def bench_size(n_rows, repeat, with_figures):
+    raw = generate(n_rows)
+    offsets = {crop: 1 + i % 12 for i, crop in enumerate(sorted(raw['CROP'].unique()))}
+    timings = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.csv")
+        raw.to_csv(path, index=False)
+        loaded, timings["read_csv"] = best_of(repeat, read_csv, path)
+    df, timings["clean_dataset"] = best_of(repeat, lambda: clean_dataset(loaded.copy()))
+
+    rows, timings["filter_rows"] = best_of(repeat, filter_rows, df, None, None, ALL_MONTHS)
+    plan, timings["plan_spray"] = best_of(repeat, lambda: plan_spray(rows.copy(), offsets))
+    plan, timings["match_rain"] = best_of(repeat, lambda: match_rain(plan.copy(), STATE))
+    cube, timings["count_cube"] = best_of(repeat, CountCube, df, STATE)
+    frames, timings["chart_frames"] = best_of(repeat, build_chart_frames, cube, offsets)
+    if with_figures:
+        _, timings["figures"] = best_of(repeat, build_figures, frames)
+
+    def rerun():
+        match_rain(plan_spray(filter_rows(df), offsets), STATE)
+        chart_frames = build_chart_frames(cube, offsets)
+        if with_figures:
+            build_figures(chart_frames)
+
+    _, timings["rerun"] = best_of(repeat, rerun)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the spray-planning pipeline.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-figures", action="store_true", help="skip the Plotly figure stage")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_rows in args.rows:
+        timings = bench_size(n_rows, args.repeat, not args.no_figures)
+        for stage, seconds in timings.items():
+            results.append({"rows": n_rows, "stage": stage, "seconds": round(seconds, 6)})
+            print(f"{n_rows:>9} {stage:<14} {seconds * 1000:10.2f} ms")
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
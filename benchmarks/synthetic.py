@@ -0,0 +1,90 @@
+"""Synthetic CROP/DISTRICT/MONTH datasets for benchmarking.
+
+Crop and district names come from the real files under data/. MONTH values
+are drawn from a fixed pool of free-text strings that mix short and full month
+names, seasons, lowercase tokens and uneven separators, the way the state
+sheets do. A fixed pool keeps the number of distinct MONTH values realistic.
+
+    python benchmarks/synthetic.py                      # 10k, 100k and 1M rows
+    python benchmarks/synthetic.py --rows 50000 --out-dir /tmp/synthetic
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+from mithron.loader import csv_paths  # noqa: E402
+from mithron.months import full_month_order, month_order, season_months  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _vocabulary(column):
+    values = set()
+    # only the state datasets; data/ also holds the rain calendar and month reports
+    for path in csv_paths.values():
+        df = pd.read_csv(os.path.join(REPO_ROOT, path), encoding="ISO-8859-1")
+        df.columns = df.columns.str.strip()
+        values.update(df[column].dropna().astype(str).str.strip())
+    return sorted(v for v in values if v)
+
+
+def month_value_pool(size, rng):
+    """``size`` distinct MONTH strings in the formats found in the state sheets."""
+    seasons = list(season_months)
+    pool = set()
+    while len(pool) < size:
+        style = rng.integers(4)
+        if style == 0:
+            idx = np.sort(rng.choice(12, rng.integers(1, 6), replace=False))
+            tokens = [month_order[i] for i in idx]
+        elif style == 1:
+            idx = np.sort(rng.choice(12, rng.integers(1, 6), replace=False))
+            tokens = [full_month_order[i] for i in idx]
+        elif style == 2:
+            # Tamil Nadu style: short names with the odd full one mixed in
+            idx = rng.choice(12, rng.integers(2, 8), replace=False)
+            tokens = [full_month_order[i] if rng.random() < 0.2 else month_order[i] for i in idx]
+        else:
+            tokens = list(rng.choice(seasons, rng.integers(1, 4), replace=False))
+            tokens = [t.lower() if rng.random() < 0.3 else t for t in tokens]
+        sep = ", " if rng.random() < 0.8 else ","
+        pool.add(sep.join(tokens))
+    return sorted(pool)
+
+
+def generate(n_rows, seed=0, month_pool_size=400):
+    """A raw (uncleaned) state-style frame with ``n_rows`` rows."""
+    rng = np.random.default_rng(seed)
+    crops = _vocabulary("CROP")
+    districts = _vocabulary("DISTRICT")
+    months = month_value_pool(month_pool_size, rng)
+    return pd.DataFrame({
+        "S.NO": np.arange(1, n_rows + 1),
+        "CROP": rng.choice(crops, n_rows),
+        "DISTRICT": rng.choice(districts, n_rows),
+        "MONTH": rng.choice(months, n_rows),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic state datasets.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--out-dir", default=os.path.join("benchmarks", "data"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for n_rows in args.rows:
+        path = os.path.join(args.out_dir, f"synthetic_{n_rows}.csv")
+        generate(n_rows, seed=args.seed).to_csv(path, index=False)
+        print(f"{n_rows} rows -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
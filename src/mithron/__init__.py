@@ -0,0 +1,23 @@
+"""Data helpers shared by the MITHRON dashboard.
+
+The spray-planning pipeline is importable without Streamlit:
+
+    from mithron import load_dataset, build_spray_plan
+    plan = build_spray_plan(load_dataset("data/Kerala.csv"), "Kerala", offsets={"Paddy": 2})
+"""
+from mithron.engine import (ALL_STATES, build_spray_plan, display_columns, filter_rows, match_rain,
+                            plan_spray)
+from mithron.loader import clean_dataset, csv_paths, load_all_datasets, load_dataset
+
+__all__ = [
+    "ALL_STATES",
+    "build_spray_plan",
+    "clean_dataset",
+    "csv_paths",
+    "display_columns",
+    "filter_rows",
+    "load_all_datasets",
+    "load_dataset",
+    "match_rain",
+    "plan_spray",
+]
@@ -0,0 +1,82 @@
+"""Logo and CSS for the dashboard, built once per process.
+
+The logo is read and base64-encoded on first use only, and the page injects
+it once, as a CSS class, however many places show it. With Streamlit's
+static file serving on (the default in ``.streamlit/config.toml``) the page
+uses the static URL of ``src/static/logo2.png`` instead, so browsers fetch
+and cache the image like any other file. No Streamlit here.
+"""
+import base64
+import os
+import struct
+from functools import lru_cache
+
+LOGO_PATH = os.path.join("assets", "logo2.png")
+LOGO_CLASS = "mithron-logo"
+
+# Streamlit serves <app script dir>/static/* at app/static/* when
+# server.enableStaticServing is on
+STATIC_LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "logo2.png")
+STATIC_LOGO_URL = "app/static/logo2.png"
+
+THEME_COLORS = {
+    "Light": ("#fff", "#000"),
+    "Dark": ("#0e1117", "#fafafa"),
+}
+
+
+@lru_cache(maxsize=None)
+def data_uri(path, mime="image/png"):
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+@lru_cache(maxsize=None)
+def logo_source(static_serving, path=LOGO_PATH):
+    """``(image URL, file it comes from)`` for the logo, or ``None`` when there is no logo file.
+
+    The static copy when it is being served, otherwise a data URI of ``path``.
+    """
+    if static_serving and os.path.exists(STATIC_LOGO_PATH):
+        return STATIC_LOGO_URL, STATIC_LOGO_PATH
+    if os.path.exists(path):
+        return data_uri(path), path
+    return None
+
+
+@lru_cache(maxsize=None)
+def png_size(path):
+    """(width, height) from a PNG's IHDR chunk."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
+
+@lru_cache(maxsize=None)
+def logo_css(src, path):
+    """Style block defining ``.mithron-logo`` as the logo image at ``src``, read from ``path``.
+
+    Elements with the class only need a width; the height follows the image.
+    """
+    width, height = png_size(path)
+    return f"""
+<style>
+    .{LOGO_CLASS} {{
+        display: inline-block;
+        aspect-ratio: {width} / {height};
+        background: url("{src}") center / contain no-repeat;
+    }}
+</style>
+"""
+
+
+@lru_cache(maxsize=None)
+def theme_css(theme_mode):
+    background, color = THEME_COLORS[theme_mode]
+    return f"""
+<style>
+    html {{ background-color: {background}; color: {color}; }}
+    .stApp {{ background-color: {background}; color: {color}; }}
+    .stMultiSelect label {{ width: 100% !important; }}
+</style>
+"""
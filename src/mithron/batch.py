@@ -0,0 +1,146 @@
+"""Generate spray plans for every state without the dashboard.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m mithron.batch batch_config.example.json
+
+The JSON config may contain (all keys optional):
+
+    states         states to plan, default every entry in csv_paths
+    offsets        {crop: months}, applied in every state (default 1)
+    state_offsets  {state: {crop: months}}, overrides ``offsets`` per state
+    crops, districts, months
+                   filters, same meaning as the dashboard multiselects;
+                   months accepts short or full names
+    output_dir     default "spray_plans"
+
+Names that match nothing (a state, crop, district or month that is not in
+the datasets or the month vocabulary) are rejected before anything runs,
+rather than silently widening or emptying the plan.
+
+States are planned concurrently in a process pool. Each state is written to
+``<output_dir>/<State_Name>_spray_plan.csv`` in that state's month format, and
+all of them together, with a leading STATE column and the dashboard's
+all-states month format, to ``<output_dir>/spray_plan_all_states.csv``.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from mithron.engine import ALL_STATES, build_spray_plan, display_columns, state_month_names
+from mithron.loader import csv_paths, load_dataset
+from mithron.months import ALL_MONTHS, names_to_mask, token_to_mask
+
+COMBINED_FILE = "spray_plan_all_states.csv"
+
+
+def state_output_path(output_dir, state):
+    return os.path.join(output_dir, f"{state.replace(' ', '_')}_spray_plan.csv")
+
+
+def config_problems(config, states):
+    """Messages for config values that match nothing in ``states``' datasets."""
+    datasets = {state: load_dataset(csv_paths[state]) for state in states}
+    all_crops = set().union(*(df['CROP'].cat.categories for df in datasets.values()))
+    all_districts = set().union(*(df['DISTRICT'].cat.categories for df in datasets.values()))
+    problems = []
+
+    def check(label, values, known):
+        unknown = [v for v in values if v not in known]
+        if unknown:
+            problems.append(f"unknown {label}: {', '.join(map(str, unknown))}")
+
+    check("crop(s) in crops", config.get("crops") or [], all_crops)
+    check("district(s) in districts", config.get("districts") or [], all_districts)
+    check("crop(s) in offsets", config.get("offsets", {}), all_crops)
+    unknown_months = [m for m in config.get("months") or [] if m.strip().lower() not in token_to_mask]
+    if unknown_months:
+        problems.append(f"unknown month(s) in months: {', '.join(unknown_months)}")
+    for state, offsets in config.get("state_offsets", {}).items():
+        if state not in datasets:
+            problems.append(f"state_offsets names a state that is not planned: {state}")
+        else:
+            check(f"crop(s) in state_offsets[{state!r}]", offsets, set(datasets[state]['CROP'].cat.categories))
+    return problems
+
+
+def plan_state(state, config):
+    """Build and write one state's plan; returns ``(state, plan, seconds)``.
+
+    ``plan`` still has its month masks; the state's file is written with the
+    state's month names.
+    """
+    start = time.perf_counter()
+    offsets = {**config.get("offsets", {}), **config.get("state_offsets", {}).get(state, {})}
+    plan = build_spray_plan(
+        load_dataset(csv_paths[state]), state,
+        crops=config.get("crops"),
+        districts=config.get("districts"),
+        month_mask=names_to_mask(config.get("months") or []) or ALL_MONTHS,
+        offsets=offsets,
+    )
+    shown = display_columns(plan, state_month_names(state))
+    shown.to_csv(state_output_path(config["output_dir"], state), index=False)
+    return state, plan, time.perf_counter() - start
+
+
+def run_batch(config, workers=None):
+    """Plan every configured state in parallel and write the outputs.
+
+    Returns the combined plan.
+    """
+    config = {"output_dir": "spray_plans", **config}
+    states = config.get("states") or list(csv_paths)
+    unknown = [s for s in states if s not in csv_paths]
+    if unknown:
+        raise ValueError(f"Unknown state(s): {', '.join(unknown)}; choose from {', '.join(csv_paths)}")
+    problems = config_problems(config, states)
+    if problems:
+        raise ValueError("; ".join(problems))
+    os.makedirs(config["output_dir"], exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(plan_state, states, [config] * len(states)))
+
+    plans = []
+    for state, plan, seconds in results:
+        print(f"{state}: {len(plan)} rows -> {state_output_path(config['output_dir'], state)} ({seconds:.3f}s)")
+        # one month format for the combined file, as in the dashboard's all-states view
+        plans.append(display_columns(plan, state_month_names(ALL_STATES)).assign(STATE=state))
+    combined = pd.concat(plans, ignore_index=True)
+    combined = combined[['STATE'] + [c for c in combined.columns if c != 'STATE']]
+    combined_path = os.path.join(config["output_dir"], COMBINED_FILE)
+    combined.to_csv(combined_path, index=False)
+    print(f"All states: {len(combined)} rows -> {combined_path}")
+    return combined
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate spray plans for every state.")
+    parser.add_argument("config", help="JSON file with offsets and filters")
+    parser.add_argument("--output-dir", help="overrides output_dir from the config")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as f:
+        config = json.load(f)
+    if args.output_dir:
+        config["output_dir"] = args.output_dir
+
+    start = time.perf_counter()
+    try:
+        run_batch(config, workers=args.workers)
+    except (ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Plotly figures for the analytics section.
+
+Each builder takes a ``ChartFrames`` and returns a figure, or ``None`` when
+there is nothing to plot. No Streamlit here: the page decides how to show
+the figure or the empty-data warning.
+
+The two district scatters switch to WebGL traces with pre-aggregated bubbles
+once they would draw more than ``MITHRON_SCATTER_POINT_LIMIT`` markers
+(default 5000), so their payload is bounded by the district x month grid.
+"""
+import os
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+vedantu_colors = [
+    "#F78F1E", "#FFD400", "#EC007B", "#0047AB", "#0071BC", "#A3D977",
+    "#FF69B4", "#00CED1", "#8A2BE2", "#32CD32", "#DC143C", "#20B2AA"
+]
+
+SCATTER_POINT_LIMIT = int(os.environ.get("MITHRON_SCATTER_POINT_LIMIT", 5000))
+
+
+def spray_scatter(frames, max_points=None):
+    """One marker per (crop, district, spray month), coloured by crop.
+
+    Above ``max_points`` markers: one WebGL bubble per (district, spray
+    month), sized by the number of crops.
+    """
+    spray_crop_data = frames.spray_points
+    if spray_crop_data.empty:
+        return None
+    if len(spray_crop_data) > (max_points or SCATTER_POINT_LIMIT):
+        fig = px.scatter(
+            frames.spray_bubbles,
+            x='Suggested Spray Month',
+            y='DISTRICT',
+            size='Crops',
+            hover_data=['Crops', 'Rows'],
+            title="🌾 Crop Variety Spray Plan by District & Month (crops per bubble)",
+            color_discrete_sequence=[vedantu_colors[0]],
+            size_max=14,
+            height=700,
+            render_mode='webgl'
+        )
+    else:
+        fig = px.scatter(
+            spray_crop_data,
+            x='Suggested Spray Month',
+            y='DISTRICT',
+            color='CROP',
+            size='Bubble Size',
+            hover_data=['CROP', 'DISTRICT', 'Suggested Spray Month'],
+            title="🌾 Crop Variety Spray Plan by District & Month",
+            size_max=7,
+            opacity=1,
+            height=700
+        )
+    fig.update_traces(marker=dict(line=dict(width=0.9, color='black')))
+    fig.update_layout(xaxis_title="Spray Month", yaxis_title="District", plot_bgcolor="#fff")
+    return fig
+
+
+def crop_month_line(frames):
+    """Rows per sowing month, one line per crop."""
+    if frames.empty:
+        return None
+    return px.line(
+        frames.crop_month_counts,
+        x='MONTH',
+        y='Count',
+        color='CROP',
+        markers=True,
+        title="🌾 Crop Frequency by Sowing Month"
+    )
+
+
+def spray_month_scatter(frames, max_points=None):
+    """Distinct crop/district pairs coloured by spray month.
+
+    Above ``max_points`` markers: one WebGL bubble per crop/district pair,
+    sized by its number of spray months.
+    """
+    scatter_data = frames.spray_combinations
+    if scatter_data.empty:
+        return None
+    if len(scatter_data) > (max_points or SCATTER_POINT_LIMIT):
+        fig = px.scatter(
+            frames.spray_month_spread,
+            x='CROP',
+            y='DISTRICT',
+            size='Spray Months',
+            color='Spray Months',
+            color_continuous_scale=vedantu_colors[:6],
+            title='🗓️ Crop Appearance by District (spray months per crop)',
+            size_max=12,
+            height=800,
+            render_mode='webgl'
+        )
+        fig.update_traces(marker=dict(opacity=0.7, line=dict(width=1, color='black')))
+        return fig
+    fig = px.scatter(
+        scatter_data,
+        x='CROP',
+        y='DISTRICT',
+        color='Suggested Spray Month',
+        color_discrete_sequence=vedantu_colors,
+        title='🗓️ Crop Appearance by District (Vedantu Style Colors by Month)',
+        height=800
+    )
+    fig.update_traces(marker=dict(size=10, opacity=0.7, line=dict(width=1, color='black')))
+    return fig
+
+
+def distribution_donut(frames, group_col, label):
+    """Share of rows per value of ``group_col``; ``label`` is the selector text."""
+    donut_summary = frames.value_counts(group_col)
+    if donut_summary.empty:
+        return None
+    fig = px.pie(
+        donut_summary,
+        names=group_col,
+        values='Count',
+        hole=0.45,
+        title=f"🍩 {label} Distribution Overview",
+        color_discrete_sequence=px.colors.sequential.Plasma_r
+    )
+    fig.update_traces(
+        textposition='inside', textinfo='percent+label',
+        marker=dict(line=dict(color='#ffffff', width=2)),
+        pull=[0.02] * len(donut_summary)
+    )
+    fig.update_layout(
+        annotations=[dict(text=group_col, x=0.5, y=0.5, font_size=18, showarrow=False)]
+    )
+    return fig
+
+
+def district_month_bar(frames):
+    """Distinct sowing months per district."""
+    if frames.empty:
+        return None
+    return px.bar(
+        frames.district_month_counts,
+        x='SOWING MONTH COUNT',
+        y='DISTRICT',
+        orientation='h',
+        title='📅 Sowing Month Count per District',
+        text_auto=True
+    )
+
+
+def crop_spread_radar(frames):
+    """Sowing vs suggested spray month spread for the top 10 crops."""
+    if frames.empty:
+        return None
+    radar_df = frames.crop_month_spread
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=radar_df['Sowing Months'],
+        theta=radar_df['CROP'],
+        fill='toself',
+        name='Sowing',
+        line_color='rgba(148, 0, 211, 0.9)',
+        fillcolor='rgba(186, 85, 211, 0.3)'
+    ))
+    fig.add_trace(go.Scatterpolar(
+        r=radar_df['Suggested Spray Months'],
+        theta=radar_df['CROP'],
+        fill='toself',
+        name='Suggested Spray',
+        line_color='rgba(255, 105, 180, 0.9)',
+        fillcolor='rgba(255, 182, 193, 0.3)'
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, max(radar_df[['Sowing Months', 'Suggested Spray Months']].max()) + 1])),
+        showlegend=True,
+        title="🕸️ Radar Chart – Crop Month Spread (Pink/Violet Theme)",
+        height=600
+    )
+    return fig
+
+
+def district_rain_bar(frames):
+    """Spray months falling in the rainy season, summed per district."""
+    if frames.empty:
+        return None
+    return px.bar(
+        frames.district_rain_counts,
+        x='DISTRICT',
+        y='Rainy Match Count',
+        title="🌧️ Rainy Month Match Count per District",
+        text_auto=True
+    )
+
+
+def crop_rain_donut(frames):
+    """Rows per crop split by whether any spray month hits the rainy season."""
+    if frames.empty:
+        return None
+    crop_summary = frames.crop_rain_summary
+    green_shades = px.colors.sequential.Greens[len(crop_summary):] + px.colors.sequential.Greens[:len(crop_summary)]
+
+    fig = px.pie(
+        crop_summary,
+        names='CROP',
+        values='Count',
+        color='CROP',
+        title="🌿 Crop-wise Suggested Spray Match with Rainy Season",
+        hole=0.4,
+        color_discrete_sequence=green_shades
+    )
+    fig.update_traces(
+        textposition='outside',
+        textinfo='label+percent',
+        marker=dict(line=dict(color='#ffffff', width=2))
+    )
+    fig.update_layout(annotations=[dict(text="Crops", x=0.5, y=0.5, font_size=18, showarrow=False)])
+    return fig
@@ -0,0 +1,177 @@
+"""Dense count cube behind the analytics charts.
+
+Built once per dataset: ``counts[g, d, c]`` is the number of rows whose
+sowing mask is the ``g``-th distinct MONTH_MASK, in district ``d``, growing
+crop ``c``. State sheets only use a few dozen distinct month strings, so
+the cube stays small however many rows there are.
+
+Every chart input is a projection of it. Crop, district and sowing-month
+filters select slices of the three axes; with the same "any overlapping
+month" semantics as ``engine.filter_rows``. Spray months are the group masks
+rotated per crop, and rain matches AND those against each district's rain
+mask. Chart preparation therefore scales with the cube, not with the rows.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from mithron.engine import DEFAULT_OFFSET
+from mithron.months import ALL_MONTHS, popcount, rotate_masks
+from mithron.rain import rain_masks_for
+
+_month_bits = np.arange(12)
+
+# state -> (dataset signature, CountCube); one live cube per state
+_cubes = {}
+_lock = threading.Lock()
+
+
+def mask_bits(masks):
+    """``masks[..., None]`` expanded into a trailing 0/1 axis of 12 months."""
+    return (np.asarray(masks, dtype=np.int64)[..., None] >> _month_bits) & 1
+
+
+def _first_seen(codes):
+    """Distinct codes in order of first appearance, and each row's position in that order."""
+    order = pd.unique(codes)
+    position = np.empty(order.max() + 1 if len(order) else 0, dtype=np.int64)
+    position[order] = np.arange(len(order))
+    return order, position[codes]
+
+
+class CountCube:
+    """Row counts of one cleaned dataset by (sowing mask, district, crop).
+
+    Districts are (state, district) pairs when the frame has a STATE column,
+    so each keeps its own state's rain calendar. Axes follow the order in
+    which crops and districts first appear in the data.
+    """
+
+    def __init__(self, df, state=None):
+        group_masks, groups = np.unique(df['MONTH_MASK'].to_numpy(), return_inverse=True)
+        crop_order, crops = _first_seen(df['CROP'].cat.codes.to_numpy())
+
+        district_codes = df['DISTRICT'].cat.codes.to_numpy().astype(np.int64)
+        n_district_codes = len(df['DISTRICT'].cat.categories)
+        if 'STATE' in df.columns:
+            state_codes = df['STATE'].cat.codes.to_numpy().astype(np.int64)
+            pair_order, districts = _first_seen(state_codes * n_district_codes + district_codes)
+            district_states = df['STATE'].cat.categories.to_numpy()[pair_order // n_district_codes]
+            district_names = df['DISTRICT'].cat.categories.to_numpy()[pair_order % n_district_codes]
+        else:
+            pair_order, districts = _first_seen(district_codes)
+            district_states = np.full(len(pair_order), state, dtype=object)
+            district_names = df['DISTRICT'].cat.categories.to_numpy()[pair_order]
+
+        shape = (len(group_masks), len(pair_order), len(crop_order))
+        flat = (groups * shape[1] + districts) * shape[2] + crops
+        self.counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        self.group_masks = group_masks.astype(np.int64)
+        self.crops = df['CROP'].cat.categories.to_numpy()[crop_order]
+        self.districts = district_names
+        self.district_states = district_states
+
+    def rain_masks(self):
+        """Rain mask per district entry, from the current rain calendar.
+
+        Looked up on every projection rather than stored, so an edited
+        calendar file applies without rebuilding the cube.
+        """
+        masks = np.zeros(len(self.districts), dtype=np.int64)
+        for district_state in pd.unique(self.district_states):
+            in_state = self.district_states == district_state
+            masks[in_state] = rain_masks_for(district_state, self.districts[in_state])
+        return masks
+
+    def project(self, crops=None, districts=None, month_mask=ALL_MONTHS, offsets=None):
+        """Month-level counts for one filter/offset selection; see ``CubeSlice``."""
+        groups = (self.group_masks & month_mask) != 0
+        crop_sel = np.isin(self.crops, list(crops)) if crops else np.ones(len(self.crops), bool)
+        district_sel = (np.isin(self.districts, list(districts)) if districts
+                        else np.ones(len(self.districts), bool))
+        counts = self.counts[np.ix_(groups, district_sel, crop_sel)]
+        return CubeSlice(
+            counts,
+            self.group_masks[groups],
+            self.crops[crop_sel],
+            self.districts[district_sel],
+            self.district_states[district_sel],
+            self.rain_masks()[district_sel],
+            offsets or {},
+        )
+
+
+class CubeSlice:
+    """Projection of a ``CountCube`` for one selection.
+
+    ``sow`` / ``spray`` are ``[crop, district, month]`` row counts per month;
+    ``rows`` counts rows per ``[crop, district]``, ``rain_rows`` those whose
+    spray months hit the rainy season and ``rain_months`` the number of
+    such spray months.
+    """
+
+    def __init__(self, counts, group_masks, crops, districts, district_states, rain_masks, offsets):
+        self.crops = crops
+        self.districts = districts
+        self.district_states = district_states
+        # [group, crop] spray masks: each crop's own rotation of every sowing mask
+        shifts = np.array([offsets.get(c, DEFAULT_OFFSET) for c in crops], dtype=np.int64)
+        spray_masks = rotate_masks(group_masks[:, None], shifts[None, :]).astype(np.int64)
+        rain_hits = spray_masks[:, :, None] & rain_masks[None, None, :]
+
+        # Batched matmuls over the group axis; float64 for BLAS, exact for any realistic count
+        by_crop = counts.transpose(2, 1, 0).astype(np.float64)  # [crop, district, group]
+        self.rows = counts.sum(axis=0).T
+        self.sow = np.rint(by_crop @ mask_bits(group_masks)).astype(np.int64)
+        self.spray = np.rint(by_crop @ mask_bits(spray_masks.T)).astype(np.int64)
+        rain_hits = rain_hits.transpose(1, 2, 0)  # [crop, district, group]
+        self.rain_rows = np.rint((by_crop * (rain_hits != 0)).sum(axis=2)).astype(np.int64)
+        self.rain_months = np.rint((by_crop * popcount(rain_hits)).sum(axis=2)).astype(np.int64)
+
+    @property
+    def empty(self):
+        return not self.rows.any()
+
+    def _labels(self, index):
+        return {
+            'STATE': self.district_states[index[1]],
+            'CROP': self.crops[index[0]],
+            'DISTRICT': self.districts[index[1]],
+        }
+
+    def months(self, values, month_names, month_col='MONTH'):
+        """Non-zero cells of a ``[crop, district, month]`` array as a tidy frame.
+
+        Rows come crop-major, then district, then month, like the row order of
+        the state sheets; ``Count`` holds the cell value.
+        """
+        index = np.nonzero(values)
+        frame = self._labels(index)
+        frame[month_col] = np.asarray(month_names, dtype=object)[index[2]]
+        frame['Count'] = values[index]
+        return pd.DataFrame(frame)
+
+    def cells(self):
+        """One row per non-empty (crop, district) with its row and rain-match counts."""
+        index = np.nonzero(self.rows)
+        frame = self._labels(index)
+        frame['Rows'] = self.rows[index]
+        frame['Rain Rows'] = self.rain_rows[index]
+        frame['Rain Months'] = self.rain_months[index]
+        return pd.DataFrame(frame)
+
+
+def count_cube(df, signature, state=None):
+    """Process-wide ``CountCube`` for ``state``, rebuilt when ``signature`` changes.
+
+    ``signature`` is the loader's file signature of the dataset behind ``df``.
+    """
+    with _lock:
+        cached = _cubes.get(state)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    cube = CountCube(df, state)
+    with _lock:
+        _cubes[state] = (signature, cube)
+    return cube
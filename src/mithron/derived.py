@@ -0,0 +1,121 @@
+"""Derived frames behind the analytics charts.
+
+Several charts need the same sowing/spray month counts; ``ChartFrames``
+builds each one on first use from a ``CubeSlice`` (see mithron.cube) and
+hands the same object to every chart. Nothing here touches the plan rows.
+"""
+from functools import cached_property
+
+import pandas as pd
+
+
+class ChartFrames:
+    """Lazily built, shared chart inputs for one projected count cube.
+
+    Frames are treated as read-only once built; charts that need extra
+    columns work on an ``assign``-ed copy.
+    """
+
+    def __init__(self, cube_slice, month_order):
+        self.cube_slice = cube_slice
+        self.month_order = month_order
+        self._value_counts = {}
+
+    def _ordered_months(self, values):
+        return pd.Categorical(values, categories=self.month_order, ordered=True)
+
+    @property
+    def empty(self):
+        return self.cube_slice.empty
+
+    @cached_property
+    def sowing(self):
+        """Row count per (crop, district, sowing month)."""
+        return self.cube_slice.months(self.cube_slice.sow, self.month_order)
+
+    @cached_property
+    def spray(self):
+        """Row count per (crop, district, suggested spray month)."""
+        return self.cube_slice.months(self.cube_slice.spray, self.month_order, 'Suggested Spray Month')
+
+    @cached_property
+    def cells(self):
+        return self.cube_slice.cells()
+
+    @cached_property
+    def spray_points(self):
+        """One point per (crop, district, spray month) with the month as an ordered categorical."""
+        return self.spray.assign(**{
+            'Bubble Size': 0.5,
+            'Suggested Spray Month': self._ordered_months(self.spray['Suggested Spray Month']),
+        })
+
+    @cached_property
+    def spray_combinations(self):
+        """Distinct (district, crop, spray month) triples."""
+        combos = self.spray[['DISTRICT', 'CROP', 'Suggested Spray Month']].drop_duplicates()
+        return combos.assign(**{
+            'Suggested Spray Month': self._ordered_months(combos['Suggested Spray Month'])
+        })
+
+    @cached_property
+    def spray_bubbles(self):
+        """Crops and rows per (district, spray month), for the aggregated spray scatter."""
+        bubbles = self.spray.groupby(['DISTRICT', 'Suggested Spray Month']).agg(
+            Crops=('CROP', 'nunique'), Rows=('Count', 'sum')).reset_index()
+        return bubbles.assign(**{
+            'Suggested Spray Month': self._ordered_months(bubbles['Suggested Spray Month'])
+        })
+
+    @cached_property
+    def spray_month_spread(self):
+        """Distinct spray months per (crop, district), for the aggregated month scatter."""
+        return self.spray_combinations.groupby(['CROP', 'DISTRICT'], sort=False).size().reset_index(name='Spray Months')
+
+    @cached_property
+    def crop_month_counts(self):
+        months = self.sowing.assign(MONTH=self._ordered_months(self.sowing['MONTH']))
+        return months.groupby(['MONTH', 'CROP'], observed=True)['Count'].sum().reset_index()
+
+    @cached_property
+    def district_month_counts(self):
+        counts = self.sowing.groupby(['DISTRICT'])['MONTH'].nunique().reset_index()
+        counts.columns = ['DISTRICT', 'SOWING MONTH COUNT']
+        return counts
+
+    @cached_property
+    def crop_month_spread(self):
+        """Top 10 crops by distinct sowing / spray month count (radar chart)."""
+        sow_count = self.sowing.groupby('CROP')['MONTH'].nunique().reset_index(name='Sowing Months')
+        spray_count = self.spray.groupby('CROP')['Suggested Spray Month'].nunique().reset_index(name='Suggested Spray Months')
+
+        spread = pd.merge(sow_count, spray_count, on='CROP', how='inner')
+        spread['Max'] = spread[['Sowing Months', 'Suggested Spray Months']].max(axis=1)
+        return spread.sort_values(by='Max', ascending=False).head(10).drop(columns='Max')
+
+    def value_counts(self, group_col):
+        """Row counts per value of ``group_col``; MONTH counts rows per sowing month."""
+        if group_col not in self._value_counts:
+            source, counts = (self.sowing, 'Count') if group_col == 'MONTH' else (self.cells, 'Rows')
+            # stable sort so ties keep first-seen order
+            summary = (source.groupby(group_col, sort=False)[counts].sum()
+                       .sort_values(ascending=False, kind='stable').reset_index())
+            summary.columns = [group_col, 'Count']
+            self._value_counts[group_col] = summary
+        return self._value_counts[group_col]
+
+    @cached_property
+    def district_rain_counts(self):
+        counts = self.cells.groupby('DISTRICT')['Rain Months'].sum().reset_index()
+        counts.columns = ['DISTRICT', 'Rainy Match Count']
+        return counts
+
+    @cached_property
+    def crop_rain_summary(self):
+        """Rows per crop with / without a spray month in the rainy season."""
+        per_crop = self.cells.groupby('CROP')[['Rows', 'Rain Rows']].sum()
+        summary = pd.DataFrame({
+            'Match': per_crop['Rain Rows'],
+            'No Match': per_crop['Rows'] - per_crop['Rain Rows'],
+        }).stack().rename_axis(['CROP', 'Has Match']).reset_index(name='Count')
+        return summary[summary['Count'] > 0].reset_index(drop=True)
@@ -0,0 +1,92 @@
+"""Headless spray-planning pipeline.
+
+    load_dataset -> clean_dataset -> filter_rows -> plan_spray -> match_rain
+
+Every stage takes and returns a DataFrame and none of them touch Streamlit,
+so the dashboard, batch jobs and benchmarks all run the same code.
+``build_spray_plan`` chains the stages for one state.
+
+Months stay 12-bit masks through every stage; ``display_columns`` turns
+them into short or full month names for the table and exports.
+"""
+import numpy as np
+
+from mithron.months import ALL_MONTHS, full_month_order, mask_labels, month_order, rotate_masks
+from mithron.rain import row_rain_masks
+
+# Same default as the dashboard's offset inputs
+DEFAULT_OFFSET = 1
+
+# Mask columns the pipeline adds; kept for later stages, never shown or exported
+INTERNAL_COLUMNS = ['MONTH_MASK', 'SPRAY_MASK', 'RAIN_MATCH_MASK']
+
+full_month_states = {"Andhra Pradesh", "Karnataka"}
+
+# Pseudo-state for the union of every dataset (see loader.load_all_datasets)
+ALL_STATES = "All South India"
+
+
+def state_month_names(state):
+    """Month names the state's sheet uses; the single place the display format is chosen."""
+    return full_month_order if state in full_month_states else month_order
+
+
+def filter_rows(df, crops=None, districts=None, month_mask=ALL_MONTHS):
+    """Rows whose crop, district and sowing months match; empty selections mean "all"."""
+    keep = (df['MONTH_MASK'] & month_mask) != 0
+    if crops:
+        keep &= df['CROP'].isin(crops)
+    if districts:
+        keep &= df['DISTRICT'].isin(districts)
+    return df[keep].copy()
+
+
+def crop_offsets(crops, offsets, default=DEFAULT_OFFSET):
+    """Per-row offset for a categorical CROP column, looked up once per category."""
+    by_code = np.array([offsets.get(crop, default) for crop in crops.cat.categories] + [default],
+                       dtype=np.int64)
+    return by_code[crops.cat.codes.to_numpy()]
+
+
+def plan_spray(rows, offsets):
+    """Add the suggested spray months (SPRAY_MASK) to ``rows`` (in place) and return it.
+
+    Spray months are the sowing mask rotated by each crop's offset.
+    """
+    rows['SPRAY_MASK'] = rotate_masks(rows['MONTH_MASK'], crop_offsets(rows['CROP'], offsets))
+    rows['Manual Spray Month'] = ""
+    return rows
+
+
+def match_rain(plan, state=None):
+    """Add the rainy-month overlap of each spray plan row (in place) and return it.
+
+    One AND against the district's rain mask gives RAIN_MATCH_MASK, whose
+    ``popcount`` is the match count. Frames with a STATE column use each
+    row's own state calendar.
+    """
+    plan['RAIN_MATCH_MASK'] = plan['SPRAY_MASK'].to_numpy() & row_rain_masks(plan, state)
+    return plan
+
+
+def build_spray_plan(df, state, crops=None, districts=None, month_mask=ALL_MONTHS, offsets=None):
+    """Filtered, planned and rain-matched frame for one state's cleaned dataset.
+
+    For ``ALL_STATES`` pass the combined frame from ``load_all_datasets``.
+    """
+    plan = plan_spray(filter_rows(df, crops, districts, month_mask), offsets or {})
+    return match_rain(plan, state)
+
+
+def display_columns(plan, month_names=month_order):
+    """The plan as shown in the table and exports.
+
+    Spray and rain masks become month names (``month_names``, see
+    ``state_month_names``) and the internal mask columns are dropped.
+    """
+    shown = plan.drop(columns=INTERNAL_COLUMNS)
+    shown.insert(shown.columns.get_loc('Manual Spray Month'), 'Suggested Spray Month',
+                 mask_labels(plan['SPRAY_MASK'].to_numpy(), month_names))
+    matches = plan['RAIN_MATCH_MASK'].to_numpy()
+    shown['Rainy Season'] = np.where(matches != 0, mask_labels(matches, month_names), "No Possibility")
+    return shown
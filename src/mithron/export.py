@@ -0,0 +1,90 @@
+"""Chunked spray plan export in several formats.
+
+Nothing is serialised until an export is requested. Writers stream the plan
+``chunk_rows`` rows at a time into a file object, so no full-table string or
+second copy of the frame is built. ``export_plan`` returns the finished
+file as bytes: ``st.download_button`` needs the whole payload in memory
+anyway, so the dashboard keeps exactly one export per session and drops it
+once the plan, overrides or format change.
+
+XLSX needs openpyxl, which is a requirement, and Parquet needs pyarrow
+(installed with Streamlit); ``available_formats`` still leaves out either
+one if an incomplete install lacks it.
+"""
+import gzip
+import importlib.util
+import io
+from collections import namedtuple
+
+ExportFormat = namedtuple("ExportFormat", ["extension", "mime", "requires"])
+
+EXPORT_FORMATS = {
+    "CSV": ExportFormat("csv", "text/csv", None),
+    "CSV (gzip)": ExportFormat("csv.gz", "application/gzip", None),
+    "Parquet": ExportFormat("parquet", "application/vnd.apache.parquet", "pyarrow"),
+    "Excel (xlsx)": ExportFormat("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "openpyxl"),
+}
+
+CHUNK_ROWS = 50_000
+
+
+def available_formats():
+    """Names from ``EXPORT_FORMATS`` whose optional dependency is importable."""
+    return [name for name, fmt in EXPORT_FORMATS.items()
+            if fmt.requires is None or importlib.util.find_spec(fmt.requires) is not None]
+
+
+def _chunks(plan, chunk_rows):
+    for start in range(0, max(len(plan), 1), chunk_rows):
+        yield start == 0, plan.iloc[start:start + chunk_rows]
+
+
+def write_csv(plan, out, chunk_rows=CHUNK_ROWS):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    for first, chunk in _chunks(plan, chunk_rows):
+        chunk.to_csv(text, header=first, index=False)
+    text.detach()
+
+
+def write_csv_gzip(plan, out, chunk_rows=CHUNK_ROWS):
+    with gzip.GzipFile(fileobj=out, mode="wb") as compressed:
+        write_csv(plan, compressed, chunk_rows)
+
+
+def write_parquet(plan, out, chunk_rows=CHUNK_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(plan, preserve_index=False)
+    with pq.ParquetWriter(out, schema) as writer:
+        for _, chunk in _chunks(plan, chunk_rows):
+            # one row group per chunk
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(plan, out, chunk_rows=CHUNK_ROWS):
+    from openpyxl import Workbook
+
+    # write-only mode streams rows to the zip instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Spray Plan")
+    sheet.append(list(plan.columns))
+    for _, chunk in _chunks(plan, chunk_rows):
+        for row in chunk.astype(object).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(out)
+
+
+writers = {
+    "CSV": write_csv,
+    "CSV (gzip)": write_csv_gzip,
+    "Parquet": write_parquet,
+    "Excel (xlsx)": write_xlsx,
+}
+
+
+def export_plan(plan, fmt, chunk_rows=CHUNK_ROWS):
+    """``plan`` written as ``fmt``, as bytes."""
+    out = io.BytesIO()
+    writers[fmt](plan, out, chunk_rows)
+    return out.getvalue()
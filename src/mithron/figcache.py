@@ -0,0 +1,96 @@
+"""Bounded LRU cache of built Plotly figures.
+
+Figures are keyed by a fingerprint of everything they depend on (dataset,
+state, filters, offsets, theme, chart name), so flipping back to a recent
+selection skips both the pandas aggregation and the Plotly construction.
+The cache is process-wide and shared by all sessions; cached figures must
+not be modified by callers.
+
+Limits come from ``MITHRON_FIGURE_CACHE_ENTRIES`` (default 128) and
+``MITHRON_FIGURE_CACHE_MB`` (default 64). The byte limit is approximate:
+figures are sized from their trace arrays, not by serializing them.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+FigureCacheInfo = namedtuple("FigureCacheInfo", ["hits", "misses", "entries", "bytes"])
+
+
+def fingerprint(*parts):
+    """Short stable digest of any ``repr``-able key parts."""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+# Rough serialized size of one list or text/object array element
+_OBJECT_ITEM_BYTES = 16
+
+
+def _data_bytes(value):
+    if isinstance(value, dict):
+        return sum(_data_bytes(v) for v in value.values())
+    if isinstance(value, np.ndarray):
+        return value.size * _OBJECT_ITEM_BYTES if value.dtype.kind in "OUS" else value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_data_bytes(v) if isinstance(v, dict) else _OBJECT_ITEM_BYTES for v in value)
+    return 0
+
+
+def figure_size(fig):
+    """Approximate bytes of a figure's trace data (its arrays), without serializing it."""
+    return sum(_data_bytes(trace.to_plotly_json()) for trace in fig.data)
+
+
+class FigureCache:
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Cached figure for ``key``, calling ``build()`` on a miss.
+
+        ``build`` may return ``None`` (no data); that is cached too.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key][0]
+
+        fig = build()
+        size = figure_size(fig) if fig is not None else 0
+        with self._lock:
+            self._misses += 1
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (fig, size)
+                self._bytes += size
+                self._evict()
+        return fig
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def info(self):
+        with self._lock:
+            return FigureCacheInfo(self._hits, self._misses, len(self._entries), self._bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = self._hits = self._misses = 0
+
+
+figure_cache = FigureCache(
+    max_entries=int(os.environ.get("MITHRON_FIGURE_CACHE_ENTRIES", 128)),
+    max_bytes=int(float(os.environ.get("MITHRON_FIGURE_CACHE_MB", 64)) * 1024 * 1024),
+)
@@ -0,0 +1,189 @@
+"""State dataset loading with a process-wide, file-signature keyed cache.
+
+Streamlit re-executes the page on every widget interaction; keeping the
+cache at module level means the CSV is parsed and cleaned once per process
+(shared by all sessions) until the file's size or mtime changes.
+
+When ``python -m mithron.snapshot`` has written a columnar snapshot that is
+newer than the CSV, it is memory-mapped instead of parsing the CSV.
+"""
+import logging
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mithron.months import parse_month_masks, unknown_month_tokens
+
+logger = logging.getLogger(__name__)
+
+csv_paths = {
+    "Tamil Nadu": os.path.join("data", "Tamilnadu.csv"),
+    "Kerala": os.path.join("data", "Kerala.csv"),
+    "Andhra Pradesh": os.path.join("data", "Andhra.csv"),
+    "Karnataka": os.path.join("data", "Karnataka.csv")
+}
+
+# Bump whenever the cleaned frame's columns or dtypes change
+SNAPSHOT_SCHEMA_VERSION = 2
+SNAPSHOT_VERSION_KEY = b"mithron.schema_version"
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "currsize"])
+
+_cache = {}
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+_combined = None
+
+
+def file_signature(path):
+    """``(absolute path, size, mtime_ns)``; changes whenever the file is edited."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def read_csv(path):
+    try:
+        return pd.read_csv(path, encoding='utf-8')
+    except UnicodeDecodeError:
+        return pd.read_csv(path, encoding='ISO-8859-1')
+
+
+def clean_dataset(df):
+    df.columns = df.columns.str.strip()
+    df['MONTH'] = df['MONTH'].fillna("").astype(str).str.replace(r'\s*,\s*', ', ', regex=True).str.strip()
+    df['CROP'] = df['CROP'].astype(str).fillna("").str.strip().astype('category')
+    df['DISTRICT'] = df['DISTRICT'].astype(str).fillna("").str.strip().astype('category')
+    # Month bitmask parsed once per load (tokens matched case-insensitively);
+    # everything downstream works on this instead of strings
+    df['MONTH_MASK'] = parse_month_masks(df['MONTH'])
+    return df
+
+
+def month_report(df):
+    """MONTH problems of a cleaned dataset, one row per unknown token.
+
+    Columns: TOKEN (lower-cased; "(empty)" for rows with no month at all),
+    ROWS and S.NO (the affected serial numbers, comma separated). Each
+    distinct MONTH string is checked once.
+    """
+    codes, uniques = pd.factorize(df['MONTH'])
+    problems = {}
+    for code, value in enumerate(uniques):
+        for token in unknown_month_tokens(value) or (["(empty)"] if not value.strip() else []):
+            problems.setdefault(token, []).append(code)
+    serials = df['S.NO'].to_numpy()
+    rows = []
+    for token, token_codes in problems.items():
+        affected = serials[np.isin(codes, token_codes)]
+        rows.append((token, len(affected), ", ".join(map(str, affected))))
+    return pd.DataFrame(rows, columns=['TOKEN', 'ROWS', 'S.NO'])
+
+
+def snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".feather"
+
+
+def read_snapshot(path):
+    """Memory-map a snapshot; ``None`` if it is missing, unreadable or stale in format."""
+    try:
+        from pyarrow import feather
+        table = feather.read_table(path, memory_map=True)
+        version = (table.schema.metadata or {}).get(SNAPSHOT_VERSION_KEY)
+        if version != str(SNAPSHOT_SCHEMA_VERSION).encode():
+            logger.warning("Ignoring snapshot %s: schema version %r, expected %d",
+                           path, version, SNAPSHOT_SCHEMA_VERSION)
+            return None
+        return table.to_pandas()
+    # a truncated or corrupt file raises pyarrow.ArrowInvalid, a ValueError
+    except (ImportError, OSError, ValueError) as e:
+        logger.warning("Ignoring snapshot %s: %s", path, e)
+        return None
+
+
+def _read_cleaned(path):
+    snapshot = snapshot_path(path)
+    if os.path.exists(snapshot) and os.stat(snapshot).st_mtime_ns >= os.stat(path).st_mtime_ns:
+        df = read_snapshot(snapshot)
+        if df is not None:
+            return df
+    return clean_dataset(read_csv(path))
+
+
+def load_dataset(path):
+    """Cleaned dataset for ``path``, served from cache while the file is unchanged.
+
+    The returned frame is shared between callers and must not be modified
+    in place. Raises ``FileNotFoundError`` if ``path`` does not exist.
+    """
+    global _hits, _misses
+    signature = file_signature(path)
+    with _lock:
+        cached = _cache.get(signature[0])
+        if cached is not None and cached[0] == signature:
+            _hits += 1
+            return cached[1]
+
+    df = _read_cleaned(path)
+    report = month_report(df)
+    if not report.empty:
+        logger.warning("%s: %d row(s) with missing or unrecognised MONTH tokens (%s); "
+                       "`python -m mithron.snapshot` writes the full report",
+                       path, int(report['ROWS'].sum()), ", ".join(report['TOKEN']))
+    with _lock:
+        _misses += 1
+        _cache[signature[0]] = (signature, df)
+        logger.info("Loaded %s (%d rows); dataset cache hits=%d misses=%d",
+                    path, len(df), _hits, _misses)
+    return df
+
+
+def datasets_signature(paths):
+    return tuple(file_signature(path) for path in paths.values())
+
+
+def load_all_datasets(paths=None):
+    """Every dataset in ``paths`` (default ``csv_paths``) in one frame with a leading STATE column.
+
+    Files are loaded concurrently through ``load_dataset``, so unchanged files
+    come from its cache; the combined frame itself is cached on the
+    signatures of all files. Like ``load_dataset``, the result is shared and
+    must not be modified in place.
+    """
+    global _combined
+    paths = paths or csv_paths
+    signature = datasets_signature(paths)
+    with _lock:
+        if _combined is not None and _combined[0] == signature:
+            return _combined[1]
+
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        frames = list(pool.map(load_dataset, paths.values()))
+    combined = pd.concat(
+        [frame.assign(STATE=state) for state, frame in zip(paths, frames)],
+        ignore_index=True,
+    )
+    # concat falls back to object dtype when the category sets differ
+    for col in ('STATE', 'CROP', 'DISTRICT'):
+        combined[col] = combined[col].astype('category')
+    combined = combined[['STATE'] + [c for c in combined.columns if c != 'STATE']]
+    with _lock:
+        _combined = (signature, combined)
+    return combined
+
+
+def cache_info():
+    with _lock:
+        return CacheInfo(_hits, _misses, len(_cache))
+
+
+def cache_clear():
+    global _hits, _misses, _combined
+    with _lock:
+        _cache.clear()
+        _hits = _misses = 0
+        _combined = None
@@ -0,0 +1,117 @@
+"""Month vocabulary and 12-bit month masks.
+
+Bit ``i`` of a mask stands for month ``i`` (Jan = bit 0 ... Dec = bit 11), so a
+MONTH cell such as ``"Jun, July, Monsoon"`` collapses to one small integer and
+month filtering becomes a bitwise AND.
+"""
+import numpy as np
+import pandas as pd
+
+month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+full_month_order = ['January', 'February', 'March', 'April', 'May', 'June',
+                    'July', 'August', 'September', 'October', 'November', 'December']
+
+ALL_MONTHS = (1 << 12) - 1
+
+season_months = {
+    "Autumn": [9, 10],
+    "Summer": [2, 3, 4],
+    "Winter": [10, 11, 0, 1],
+    "Monsoon": [5, 6, 7, 8, 9, 10],
+    "Annual": list(range(12)),
+    "Perennial": list(range(12)),
+}
+
+
+def months_to_mask(indices):
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+
+# Every token the MONTH column may contain, lower-cased, mapped to its mask;
+# tokens are matched case-insensitively ("winter" == "Winter")
+token_to_mask = {}
+for i, (short, full) in enumerate(zip(month_order, full_month_order)):
+    token_to_mask[short.lower()] = 1 << i
+    token_to_mask[full.lower()] = 1 << i
+for season, indices in season_months.items():
+    token_to_mask[season.lower()] = months_to_mask(indices)
+
+
+def month_tokens(month_field):
+    """Normalised (stripped, lower-case, non-empty) tokens of one MONTH value."""
+    if pd.isna(month_field):
+        return []
+    return [t for t in (part.strip().lower() for part in str(month_field).split(',')) if t]
+
+
+def parse_month_mask(month_field):
+    """Mask for a single comma separated MONTH value; unknown tokens are ignored."""
+    mask = 0
+    for token in month_tokens(month_field):
+        mask |= token_to_mask.get(token, 0)
+    return mask
+
+
+def unknown_month_tokens(month_field):
+    """Tokens of one MONTH value that are not in the month vocabulary."""
+    return [t for t in month_tokens(month_field) if t not in token_to_mask]
+
+
+def parse_month_masks(months):
+    """Vectorised ``parse_month_mask`` over a Series.
+
+    Each distinct string is parsed once, so the cost is per unique value
+    rather than per row.
+    """
+    codes, uniques = pd.factorize(months)
+    # code -1 (missing) picks the trailing 0
+    lookup = np.array([parse_month_mask(u) for u in uniques] + [0], dtype=np.uint16)
+    return lookup[codes]
+
+
+def names_to_mask(names):
+    """Mask for a list of short or full month names, e.g. a multiselect value."""
+    mask = 0
+    for name in names:
+        mask |= token_to_mask.get(name.strip().lower(), 0)
+    return mask
+
+
+def rotate_masks(masks, shifts):
+    """Shift every month in each mask forward by ``shifts`` months, wrapping Dec -> Jan.
+
+    ``shifts`` may be a scalar or an array aligned with ``masks``.
+    """
+    masks = np.asarray(masks, dtype=np.int64)
+    shifts = np.asarray(shifts, dtype=np.int64) % 12
+    return (((masks << shifts) | (masks >> (12 - shifts))) & ALL_MONTHS).astype(np.uint16)
+
+
+_label_tables = {}
+
+
+def mask_labels(masks, names=month_order):
+    """Display strings ("Jan, Feb") for an array of masks, in calendar order.
+
+    ``names`` are the 12 month names to use (``month_order`` or
+    ``full_month_order``); this is the only place masks become text.
+    """
+    key = tuple(names)
+    if key not in _label_tables:
+        _label_tables[key] = np.array(
+            [', '.join(names[i] for i in range(12) if mask >> i & 1) for mask in range(ALL_MONTHS + 1)],
+            dtype=object,
+        )
+    return _label_tables[key][np.asarray(masks)]
+
+
+_popcounts = np.array([bin(mask).count("1") for mask in range(ALL_MONTHS + 1)], dtype=np.int64)
+
+
+def popcount(masks):
+    """Number of months set in each mask."""
+    return _popcounts[np.asarray(masks)]
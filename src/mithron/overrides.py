@@ -0,0 +1,130 @@
+"""Persistent "Manual Spray Month" overrides and named offset profiles.
+
+Overrides are stored in a local SQLite database in WAL mode, one row per
+(state, S.NO), so an agronomist's edits survive reruns, filter changes and
+restarts. Only changed cells are written (UPSERT, or DELETE when a cell is
+cleared); the plan itself is never stored. ``mithron.table.apply_overrides``
+merges them back into a plan.
+
+The dashboard writes each edit from the table editor's ``on_change``
+callback (``mithron.table.edited_overrides``) and merges stored overrides
+only into newly built pages. A page being edited never changes under the
+editor, which would drop its pending edits.
+
+The same database keeps named crop offset profiles, one row per
+(profile, crop).
+
+The database defaults to ``data/overrides.sqlite3``; set
+``MITHRON_OVERRIDES_DB`` to use another file.
+"""
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS manual_overrides (
+    state      TEXT    NOT NULL,
+    sno        INTEGER NOT NULL,
+    value      TEXT    NOT NULL,
+    updated_at TEXT    NOT NULL,
+    PRIMARY KEY (state, sno)
+)
+"""
+
+PROFILE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS offset_profiles (
+    name   TEXT    NOT NULL,
+    crop   TEXT    NOT NULL,
+    months INTEGER NOT NULL,
+    PRIMARY KEY (name, crop)
+)
+"""
+
+UPSERT = """
+INSERT INTO manual_overrides (state, sno, value, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (state, sno) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+"""
+
+
+class OverrideStore:
+    """Thread-safe handle on one overrides database."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # one connection shared by Streamlit's script threads, serialised by _lock
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            conn.execute(PROFILE_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def load(self, state=None):
+        """{(state, S.NO): text} for ``state``, or for every state when None."""
+        query, params = "SELECT state, sno, value FROM manual_overrides", ()
+        if state is not None:
+            query, params = query + " WHERE state = ?", (state,)
+        with self._lock:
+            rows = self._connection().execute(query, params).fetchall()
+        return {(s, sno): value for s, sno, value in rows}
+
+    def save(self, changes):
+        """Write ``{(state, S.NO): text}`` in one transaction; empty text deletes the override."""
+        if not changes:
+            return
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        upserts = [(s, int(sno), value, now) for (s, sno), value in changes.items() if value]
+        deletes = [(s, int(sno)) for (s, sno), value in changes.items() if not value]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(UPSERT, upserts)
+                conn.executemany("DELETE FROM manual_overrides WHERE state = ? AND sno = ?", deletes)
+        logger.info("Saved %d override(s), cleared %d in %s", len(upserts), len(deletes), self.path)
+
+    def offset_profiles(self):
+        """Names of the saved offset profiles, sorted."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT DISTINCT name FROM offset_profiles ORDER BY name").fetchall()
+        return [name for (name,) in rows]
+
+    def load_offsets(self, name):
+        """{crop: offset} saved under profile ``name`` (empty if unknown)."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT crop, months FROM offset_profiles WHERE name = ?", (name,)).fetchall()
+        return dict(rows)
+
+    def save_offsets(self, name, offsets):
+        """Replace profile ``name`` with ``offsets`` ({crop: months})."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM offset_profiles WHERE name = ?", (name,))
+                conn.executemany("INSERT INTO offset_profiles (name, crop, months) VALUES (?, ?, ?)",
+                                 [(name, crop, int(months)) for crop, months in offsets.items()])
+        logger.info("Saved offset profile %r (%d crops) in %s", name, len(offsets), self.path)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+override_store = OverrideStore(os.environ.get("MITHRON_OVERRIDES_DB", os.path.join("data", "overrides.sqlite3")))
@@ -0,0 +1,142 @@
+"""Rainy-season calendars compiled to month masks.
+
+Calendars are data, not code: ``data/rain_calendar.csv`` (or the file named
+by ``MITHRON_RAIN_CALENDAR``) has one row per (state, district, month) with
+columns STATE, DISTRICT, MONTH (1-12) and PROBABILITY (0-1); months without a
+row have probability 0. Any other columns are ignored. The first line must be
+``# mithron rain calendar, version N`` with a supported N. Adding districts or
+states is a data edit, and ``mithron.rainfall`` builds a calendar from daily
+rainfall history.
+
+PROBABILITY is the chance that the month is rainy in a given year. A
+hand-written calendar uses 1.0 for the district's rainy season; one built
+by ``mithron.rainfall`` uses the share of observed years in which the
+month had at least ``--rainy-month-days`` (default 10) rainy days. Either
+way a month counts as rainy when most years are, i.e. from
+``RAIN_THRESHOLD`` up.
+
+Each state's rows are compiled once per file version into a ``RainCalendar``:
+a district -> position index, a rain mask per district (months with
+PROBABILITY >= ``RAIN_THRESHOLD``) and a 12-month probability vector per
+district. Matching spray plans against it is a bitwise AND of the spray
+mask with the district's rain mask.
+"""
+import logging
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from mithron.loader import file_signature
+
+logger = logging.getLogger(__name__)
+
+RAIN_CALENDAR_PATH = os.environ.get("MITHRON_RAIN_CALENDAR", os.path.join("data", "rain_calendar.csv"))
+RAIN_CALENDAR_VERSION = 1
+RAIN_CALENDAR_HEADER = "# mithron rain calendar, version"
+RAIN_CALENDAR_COLUMNS = ['STATE', 'DISTRICT', 'MONTH', 'PROBABILITY']
+
+# A month counts as rainy from this probability up (rainy in most years)
+RAIN_THRESHOLD = float(os.environ.get("MITHRON_RAIN_THRESHOLD", 0.5))
+
+# index: district -> position. masks (uint16) and probabilities (float,
+# [n, 12]) carry one extra trailing row of zeros, so position -1 means
+# "no calendar for this district".
+RainCalendar = namedtuple("RainCalendar", ["index", "masks", "probabilities"])
+
+
+def read_rain_table(path):
+    """Validated calendar rows from ``path``; raises ``ValueError`` on a bad file."""
+    with open(path, encoding="utf-8") as f:
+        header = f.readline().strip()
+    if not header.startswith(RAIN_CALENDAR_HEADER):
+        raise ValueError(f"{path}: missing '{RAIN_CALENDAR_HEADER} N' header line")
+    version = header[len(RAIN_CALENDAR_HEADER):].strip()
+    if version != str(RAIN_CALENDAR_VERSION):
+        raise ValueError(f"{path}: rain calendar version {version!r}, expected {RAIN_CALENDAR_VERSION}")
+
+    table = pd.read_csv(path, comment="#", skipinitialspace=True)
+    missing = [c for c in RAIN_CALENDAR_COLUMNS if c not in table.columns]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    table['STATE'] = table['STATE'].astype(str).str.strip()
+    table['DISTRICT'] = table['DISTRICT'].astype(str).str.strip()
+    if not table['MONTH'].between(1, 12).all() or not table['PROBABILITY'].between(0, 1).all():
+        raise ValueError(f"{path}: MONTH must be 1-12 and PROBABILITY 0-1")
+    return table
+
+
+def compile_rain_calendar(rows):
+    """Calendar rows of one state -> ``RainCalendar``."""
+    codes, districts = pd.factorize(rows['DISTRICT'])
+    probabilities = np.zeros((len(districts) + 1, 12))
+    # duplicated (district, month) rows keep the highest probability
+    np.maximum.at(probabilities, (codes, rows['MONTH'].to_numpy(dtype=np.int64) - 1),
+                  rows['PROBABILITY'].to_numpy(dtype=float))
+    rainy = probabilities >= RAIN_THRESHOLD
+    masks = (rainy * (1 << np.arange(12))).sum(axis=1).astype(np.uint16)
+    return RainCalendar({d: i for i, d in enumerate(districts)}, masks, probabilities)
+
+
+@lru_cache(maxsize=4)
+def _compiled_calendars(signature):
+    table = read_rain_table(signature[0])
+    return {state: compile_rain_calendar(rows) for state, rows in table.groupby('STATE', sort=False)}
+
+
+def state_rain_calendar(state, path=None):
+    """Compiled calendar for ``state``; ``None`` for states without one.
+
+    Recompiled only when the calendar file changes.
+    """
+    path = path or RAIN_CALENDAR_PATH
+    if not os.path.exists(path):
+        _warn_missing(path)
+        return None
+    return _compiled_calendars(file_signature(path)).get(state)
+
+
+def rain_calendar_signature(path=None):
+    """File signature of the rain calendar (``None`` if missing), for cache keys."""
+    path = path or RAIN_CALENDAR_PATH
+    return file_signature(path) if os.path.exists(path) else None
+
+
+@lru_cache(maxsize=None)
+def _warn_missing(path):
+    logger.warning("Rain calendar %s not found; no rainy-season matches", path)
+
+
+def rain_masks_for(state, districts):
+    """Rain mask for each district name in ``districts`` (0 if not in the calendar)."""
+    calendar = state_rain_calendar(state)
+    if calendar is None:
+        return np.zeros(len(districts), dtype=np.uint16)
+    return calendar.masks[[calendar.index.get(d, -1) for d in districts]]
+
+
+def district_rain_masks(districts, state):
+    """Rain mask for every row of a categorical DISTRICT column (0 if unknown)."""
+    by_code = np.append(rain_masks_for(state, districts.cat.categories), np.uint16(0))
+    # code -1 (missing district) picks the trailing 0
+    return by_code[districts.cat.codes.to_numpy()]
+
+
+def row_rain_masks(plan, state=None):
+    """Rain mask for every row of ``plan``.
+
+    Frames with a STATE column (all-states mode) are looked up per
+    (state, district) pair, so a district name is only matched against its
+    own state's calendar; otherwise every row uses ``state``'s calendar.
+    """
+    if 'STATE' not in plan.columns:
+        return district_rain_masks(plan['DISTRICT'], state)
+    states, districts = plan['STATE'], plan['DISTRICT']
+    n_districts = len(districts.cat.categories)
+    lookup = np.zeros((len(states.cat.categories) + 1, n_districts + 1), dtype=np.uint16)
+    for i, row_state in enumerate(states.cat.categories):
+        lookup[i, :n_districts] = rain_masks_for(row_state, districts.cat.categories)
+    # code -1 (missing) picks the trailing zero row/column
+    return lookup[states.cat.codes.to_numpy(), districts.cat.codes.to_numpy()]
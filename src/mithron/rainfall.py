@@ -0,0 +1,154 @@
+"""Aggregate daily district rainfall history into a rain calendar.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m mithron.rainfall daily/*.csv -o data/rain_history.csv
+    PYTHONPATH=src python -m mithron.rainfall kerala_daily.csv --state Kerala \\
+        --district-col dist --date-col obs_date --rain-col rain_mm -o kerala_rain.csv
+
+Input files need a district, a date and a daily rainfall (mm) column, plus a
+state column unless ``--state`` names the state for every row. They are
+streamed ``--chunk-rows`` rows at a time; only per (state, district, year,
+month) running sums are kept, so memory stays bounded by the number of
+districts and years, not by file size.
+
+The output is a rain calendar file (see mithron.rain) with one row per
+(state, district, month):
+
+    PROBABILITY  share of observed years in which the month had at least
+                 ``--rainy-month-days`` rainy days (days with at least
+                 ``--rain-day-mm`` of rain): the chance the month is rainy
+    RAINY_YEARS, YEARS
+                 the counts behind it
+    RAIN_DAYS    mean number of rainy days in the month
+    RAINFALL_MM  mean monthly rainfall total
+    DAYS         observed days
+
+PROBABILITY means the same as in the hand-written calendar, so the
+dashboard's 0.5 threshold applies unchanged: a month is rainy when it was
+rainy in most years. Point ``MITHRON_RAIN_CALENDAR`` at the output (or
+replace data/rain_calendar.csv) to use it in the dashboard.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+from mithron.rain import RAIN_CALENDAR_HEADER, RAIN_CALENDAR_VERSION
+
+KEYS = ['STATE', 'DISTRICT', 'YEAR', 'MONTH']
+SUMS = ['DAYS', 'RAIN_DAYS', 'RAINFALL_MM']
+
+# IMD's definition of a rainy day
+RAIN_DAY_MM = 2.5
+# A month with this many rainy days (about one in three) is a rainy month
+RAINY_MONTH_DAYS = 10
+CHUNK_ROWS = 1_000_000
+
+
+def aggregate_chunk(chunk, columns, state=None, rain_day_mm=RAIN_DAY_MM, date_format=None):
+    """Per (state, district, year, month) sums of one chunk, and its number of unusable rows."""
+    dates = pd.to_datetime(chunk[columns['date']], format=date_format, errors='coerce')
+    rain = pd.to_numeric(chunk[columns['rain']], errors='coerce')
+    valid = (dates.notna() & rain.notna()).to_numpy()
+    states = chunk[columns['state']].astype(str).str.strip() if state is None else state
+    frame = pd.DataFrame({
+        'STATE': states,
+        'DISTRICT': chunk[columns['district']].astype(str).str.strip(),
+        'YEAR': dates.dt.year,
+        'MONTH': dates.dt.month,
+        'DAYS': 1,
+        'RAIN_DAYS': (rain >= rain_day_mm).astype(int),
+        'RAINFALL_MM': rain,
+    })[valid]
+    return frame.groupby(KEYS, sort=False)[SUMS].sum(), int((~valid).sum())
+
+
+def aggregate_files(paths, columns, state=None, rain_day_mm=RAIN_DAY_MM,
+                    chunk_rows=CHUNK_ROWS, date_format=None):
+    """Streamed per (state, district, year, month) sums over every file in ``paths``.
+
+    Returns ``(sums, rows read, rows skipped)``.
+    """
+    usecols = [columns['district'], columns['date'], columns['rain']]
+    if state is None:
+        usecols.append(columns['state'])
+    totals, rows, skipped = None, 0, 0
+    for path in paths:
+        for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_rows, dtype=str):
+            partial, bad = aggregate_chunk(chunk, columns, state, rain_day_mm, date_format)
+            totals = partial if totals is None else pd.concat([totals, partial]).groupby(level=KEYS).sum()
+            rows += len(chunk)
+            skipped += bad
+    if totals is None:
+        totals = pd.DataFrame(columns=SUMS, index=pd.MultiIndex.from_arrays([[]] * 4, names=KEYS))
+    return totals, rows, skipped
+
+
+def district_month_table(totals, rainy_month_days=RAINY_MONTH_DAYS):
+    """Yearly sums -> one calendar row per (state, district, month)."""
+    totals = totals.assign(RAINY=(totals['RAIN_DAYS'] >= rainy_month_days).astype(int))
+    monthly = totals.groupby(level=['STATE', 'DISTRICT', 'MONTH']).agg(
+        RAINY_YEARS=('RAINY', 'sum'),
+        YEARS=('DAYS', 'size'),
+        RAIN_DAYS=('RAIN_DAYS', 'sum'),
+        RAINFALL_MM=('RAINFALL_MM', 'sum'),
+        DAYS=('DAYS', 'sum'),
+    ).reset_index()
+    monthly['MONTH'] = monthly['MONTH'].astype(int)
+    monthly['PROBABILITY'] = (monthly['RAINY_YEARS'] / monthly['YEARS']).round(4)
+    monthly['RAIN_DAYS'] = (monthly['RAIN_DAYS'] / monthly['YEARS']).round(1)
+    monthly['RAINFALL_MM'] = (monthly['RAINFALL_MM'] / monthly['YEARS']).round(1)
+    return monthly[['STATE', 'DISTRICT', 'MONTH', 'PROBABILITY', 'RAINY_YEARS', 'YEARS',
+                    'RAIN_DAYS', 'RAINFALL_MM', 'DAYS']]
+
+
+def write_rain_calendar(table, path, rain_day_mm=RAIN_DAY_MM, rainy_month_days=RAINY_MONTH_DAYS):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(f"{RAIN_CALENDAR_HEADER} {RAIN_CALENDAR_VERSION}\n")
+        f.write(f"# PROBABILITY: share of years in which the month had at least {rainy_month_days} "
+                f"days with >= {rain_day_mm} mm of rain; months at or above 0.5 count as rainy\n")
+        table.to_csv(f, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate daily rainfall CSVs into a rain calendar.")
+    parser.add_argument("inputs", nargs="+", help="daily rainfall CSV files")
+    parser.add_argument("-o", "--output", required=True, help="rain calendar CSV to write")
+    parser.add_argument("--state", help="state of every input row (when there is no state column)")
+    parser.add_argument("--state-col", default="STATE")
+    parser.add_argument("--district-col", default="DISTRICT")
+    parser.add_argument("--date-col", default="DATE")
+    parser.add_argument("--rain-col", default="RAINFALL_MM")
+    parser.add_argument("--date-format", help="strftime format of the date column, e.g. %%d-%%m-%%Y (faster)")
+    parser.add_argument("--rain-day-mm", type=float, default=RAIN_DAY_MM,
+                        help=f"minimum daily rainfall of a rainy day (default {RAIN_DAY_MM})")
+    parser.add_argument("--rainy-month-days", type=int, default=RAINY_MONTH_DAYS,
+                        help=f"minimum rainy days of a rainy month (default {RAINY_MONTH_DAYS})")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    columns = {"state": args.state_col, "district": args.district_col,
+               "date": args.date_col, "rain": args.rain_col}
+    start = time.perf_counter()
+    try:
+        totals, rows, skipped = aggregate_files(args.inputs, columns, args.state, args.rain_day_mm,
+                                                args.chunk_rows, args.date_format)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    table = district_month_table(totals, args.rainy_month_days)
+    write_rain_calendar(table, args.output, args.rain_day_mm, args.rainy_month_days)
+    districts = table[['STATE', 'DISTRICT']].drop_duplicates()
+    print(f"{rows} rows ({skipped} without a usable date or rainfall) -> {len(table)} rows for "
+          f"{len(districts)} districts in {args.output} ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Write typed columnar snapshots of the state datasets.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m mithron.snapshot            # every state
+    PYTHONPATH=src python -m mithron.snapshot Kerala
+
+Each CSV in ``csv_paths`` gets a sibling ``.feather`` file (Arrow IPC,
+uncompressed so it can be memory-mapped) holding the cleaned frame:
+categorical CROP/DISTRICT, the parsed MONTH_MASK and the schema version in
+the file metadata. The dashboard picks a snapshot up automatically while it
+is newer than its CSV.
+
+Alongside each snapshot a ``.month_report.csv`` lists the MONTH tokens that
+are not in the month vocabulary (and rows with no month at all) with the
+affected S.NO values; those tokens contribute nothing to MONTH_MASK.
+"""
+import argparse
+import os
+import sys
+import time
+
+from mithron.loader import (SNAPSHOT_SCHEMA_VERSION, SNAPSHOT_VERSION_KEY, clean_dataset,
+                            csv_paths, month_report, read_csv, snapshot_path)
+
+
+def report_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".month_report.csv"
+
+
+def write_snapshot(csv_path, out_path=None):
+    import pyarrow as pa
+    from pyarrow import feather
+
+    out_path = out_path or snapshot_path(csv_path)
+    df = clean_dataset(read_csv(csv_path))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SNAPSHOT_VERSION_KEY] = str(SNAPSHOT_SCHEMA_VERSION).encode()
+    feather.write_feather(table.replace_schema_metadata(metadata), out_path,
+                          compression="uncompressed")
+    report = month_report(df)
+    report.to_csv(report_path(csv_path), index=False)
+    return out_path, len(df), report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write columnar snapshots of the state datasets.")
+    parser.add_argument("states", nargs="*", help="states to convert (default: all)")
+    args = parser.parse_args(argv)
+
+    unknown = [s for s in args.states if s not in csv_paths]
+    if unknown:
+        parser.error(f"unknown state(s): {', '.join(unknown)}; choose from {', '.join(csv_paths)}")
+
+    for state in args.states or csv_paths:
+        start = time.perf_counter()
+        out_path, rows, report = write_snapshot(csv_paths[state])
+        print(f"{state}: {rows} rows -> {out_path} ({time.perf_counter() - start:.3f}s)")
+        for token, count in zip(report['TOKEN'], report['ROWS']):
+            problem = "no MONTH" if token == "(empty)" else f"unrecognised MONTH token {token!r}"
+            print(f"  {problem} in {count} row(s), see {report_path(csv_paths[state])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
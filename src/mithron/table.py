@@ -0,0 +1,78 @@
+"""Server-side paging for the spray plan table.
+
+The dashboard only sends one page of the plan to the browser. Search, sort
+and slicing happen here on the full frame, and "Manual Spray Month" edits
+are kept in a sparse overlay keyed by (state, S.NO), so they survive paging,
+sorting and filter changes. No Streamlit here.
+"""
+import numpy as np
+import pandas as pd
+
+MANUAL_COLUMN = 'Manual Spray Month'
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def search_rows(plan, query):
+    """Rows where any text column contains ``query`` (case-insensitive)."""
+    query = query.strip()
+    if not query:
+        return plan
+    hit = np.zeros(len(plan), dtype=bool)
+    for col in plan.columns:
+        values = plan[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # match each category once, then broadcast through the codes
+            matched = values.cat.categories.astype(str).str.contains(query, case=False, regex=False)
+            hit |= np.append(matched, False)[values.cat.codes.to_numpy()]
+        elif values.dtype == object:
+            hit |= values.astype(str).str.contains(query, case=False, regex=False).to_numpy()
+    return plan[hit]
+
+
+def sort_rows(plan, column=None, ascending=True):
+    """``plan`` ordered by ``column`` (stable); unsorted when ``column`` is None."""
+    if column is None:
+        return plan
+    # categoricals sort by their text, not by category order; ties keep file order either way
+    return plan.sort_values(column, ascending=ascending, kind='stable', key=_sort_key)
+
+
+def _sort_key(values):
+    return values.astype(str) if isinstance(values.dtype, pd.CategoricalDtype) else values
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def page_rows(plan, page, page_size):
+    """The 1-based ``page`` of ``plan``."""
+    start = (page - 1) * page_size
+    return plan.iloc[start:start + page_size]
+
+
+def row_keys(plan, state):
+    """(state, S.NO) per row; the STATE column wins over ``state`` when present."""
+    states = plan['STATE'].astype(str) if 'STATE' in plan.columns else np.full(len(plan), state, dtype=object)
+    return pd.MultiIndex.from_arrays([np.asarray(states, dtype=object), plan['S.NO'].to_numpy()])
+
+
+def apply_overrides(plan, overrides, state):
+    """``plan`` with its Manual Spray Month taken from ``overrides`` ({(state, S.NO): text})."""
+    if not overrides:
+        return plan
+    values = pd.Series(overrides, dtype=object)
+    manual = values.reindex(row_keys(plan, state)).fillna("").to_numpy()
+    return plan.assign(**{MANUAL_COLUMN: manual})
+
+
+def edited_overrides(shown, edited_rows, state):
+    """{(state, S.NO): text} for the Manual Spray Month cells in a data editor's ``edited_rows``.
+
+    ``edited_rows`` maps positions in ``shown`` to ``{column: value}``, as
+    Streamlit keeps it in session_state for a keyed ``st.data_editor``.
+    """
+    edits = [(int(pos), cells[MANUAL_COLUMN]) for pos, cells in edited_rows.items() if MANUAL_COLUMN in cells]
+    keys = row_keys(shown.iloc[[pos for pos, _ in edits]], state)
+    values = [value for _, value in edits]
+    return {key: (value.strip() if isinstance(value, str) else "") for key, value in zip(keys, values)}
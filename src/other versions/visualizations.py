@@ -4,15 +4,9 @@ import plotly.graph_objects as go
 import pandas as pd
 
 def explode_months(df, col):
-    rows = []
-    for _, row in df.iterrows():
-        for m in str(row[col]).split(','):
-            m = m.strip()
-            if m:
-                r = row.copy()
-                r[col] = m
-                rows.append(r)
-    return pd.DataFrame(rows)
+    exploded = df.assign(**{col: df[col].astype(str).str.split(',')}).explode(col)
+    exploded[col] = exploded[col].str.strip()
+    return exploded[exploded[col] != ""]
 
 def get_rainy_match_count(row):
     spray_months = set(row['Suggested Spray Month'].split(', '))